@@ -4,10 +4,23 @@ OPC-UA to Modbus TCP Gateway
 Polls Modbus TCP slaves and exposes data via OPC-UA server
 """
 import asyncio
+import itertools
 import logging
 import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
 from asyncua import Server, ua
-from pymodbus.client import ModbusTcpClient
+from pymodbus.client import AsyncModbusTcpClient
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # struct-based decoding is used as fallback
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # plain numpy is fast enough at small device counts
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,17 +38,70 @@ REG_HUMIDITY = 2     # Registers 2-3 (40003-40004): f32 humidity
 REG_STATUS = 4       # Register 4 (40005): u16 status
 REG_UPTIME = 5       # Registers 5-6 (40006-40007): u32 uptime
 
-# Poll interval (seconds)
+# Poll interval (seconds) - default cadence for the sensor readings
 POLL_INTERVAL = 2.0
 
+# Register groups with independent scan periods (seconds). Status changes
+# fast, temperature/humidity follow the sensor, uptime is monotonic and
+# barely worth reading - no need to poll them all at the same rate.
+REGISTER_GROUPS = [
+    {"key": "status", "address": REG_STATUS, "count": 1, "period": 0.5},
+    {"key": "environment", "address": REG_TEMPERATURE, "count": 4, "period": POLL_INTERVAL},
+    {"key": "uptime", "address": REG_UPTIME, "count": 2, "period": 30.0},
+]
+
+# Scheduler tick (seconds) - the shortest group period
+BASE_TICK = min(group["period"] for group in REGISTER_GROUPS)
+
+# Decode work runs off the event-loop thread so OPC-UA request handling
+# isn't stalled by it; numpy releases the GIL in the heavy parts, so two
+# workers can overlap with each other and with socket I/O
+_DECODE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decode")
+
+# Absolute deadband for temperature/humidity (matches SHT3x resolution).
+# Applied before publishing, and advertised in the node descriptions so
+# subscribing clients can mirror it in a ua.DataChangeFilter.
+DEADBAND_ABSOLUTE = 0.1
+
+# Exponential backoff for failing devices (seconds): double per failure
+# up to the cap, reset on the first successful read
+BACKOFF_INITIAL = POLL_INTERVAL
+BACKOFF_MAX = 60.0
+
+# OPC-UA variables created per device:
+# (entry key, browse name, variant type, data type, initial value)
+VARIABLE_SPECS = [
+    ("temperature", "Temperature", ua.VariantType.Float, ua.ObjectIds.Float, 0.0),
+    ("humidity", "Humidity", ua.VariantType.Float, ua.ObjectIds.Float, 0.0),
+    ("device_status", "DeviceStatus", ua.VariantType.Int64, ua.ObjectIds.Int64, 0),
+    ("uptime", "Uptime", ua.VariantType.Int64, ua.ObjectIds.Int64, 0),
+    ("status", "ConnectionStatus", ua.VariantType.String, ua.ObjectIds.String, "DISCONNECTED"),
+]
+
+# Cached dtypes for the numpy decode path (registers are big-endian words)
+if np is not None:
+    _U16_BE = np.dtype(">u2")
+    _F32_BE = np.dtype(">f4")
+    _U32_BE = np.dtype(">u4")
+
+# Pre-built Struct objects for the fallback decode path - skips the
+# per-call format-string cache lookup inside the struct module
+_F32 = struct.Struct(">f")
+_HH = struct.Struct(">HH")
 
-def decode_float32(registers):
-    """Decode two Modbus registers as IEEE 754 float32 (big-endian)"""
+
+def decode_float32(registers, scratch=None):
+    """Decode two Modbus registers as IEEE 754 float32 (big-endian)
+
+    A caller decoding several fields can pass one 4-byte scratch
+    bytearray to reuse across calls, avoiding per-field allocations.
+    """
     if len(registers) != 2:
         return None
-    # Pack as big-endian 16-bit integers, unpack as big-endian float
-    bytes_data = struct.pack('>HH', registers[0], registers[1])
-    return struct.unpack('>f', bytes_data)[0]
+    if scratch is None:
+        scratch = bytearray(4)
+    _HH.pack_into(scratch, 0, registers[0], registers[1])
+    return _F32.unpack_from(scratch)[0]
 
 
 def decode_uint32(registers):
@@ -45,62 +111,331 @@ def decode_uint32(registers):
     return (registers[0] << 16) | registers[1]
 
 
-async def poll_modbus_device(client_info, nodes):
-    """Poll a single Modbus device and update OPC-UA nodes"""
-    name = client_info["name"]
-    ip = client_info["ip"]
-    port = client_info["port"]
-    unit_id = client_info["unit_id"]
-
-    client = ModbusTcpClient(ip, port=port)
-
+def decode_span(registers, start, due_keys):
+    """Decode a register span (FC03 response starting at `start`) into field values
+
+    With numpy available the span is serialized to its big-endian byte
+    payload once and every field is decoded by a single C-level
+    frombuffer call, instead of one struct pack/unpack pair per field.
+    Returns a dict keyed by field name for the due groups only.
+    """
+    values = {}
+
+    if np is not None:
+        raw = np.asarray(registers, dtype=_U16_BE).tobytes()
+        if "environment" in due_keys:
+            # Temperature and humidity are adjacent f32 pairs (regs 0-3)
+            offset = (REG_TEMPERATURE - start) * 2
+            values["temperature"], values["humidity"] = np.frombuffer(
+                raw, dtype=_F32_BE, count=2, offset=offset
+            ).tolist()
+        if "status" in due_keys:
+            values["status"] = registers[REG_STATUS - start]
+        if "uptime" in due_keys:
+            offset = (REG_UPTIME - start) * 2
+            values["uptime"] = int(np.frombuffer(raw, dtype=_U32_BE, count=1, offset=offset)[0])
+        return values
+
+    if "environment" in due_keys:
+        scratch = bytearray(4)
+        values["temperature"] = decode_float32(registers[REG_TEMPERATURE - start:REG_TEMPERATURE - start + 2], scratch)
+        values["humidity"] = decode_float32(registers[REG_HUMIDITY - start:REG_HUMIDITY - start + 2], scratch)
+    if "status" in due_keys:
+        values["status"] = registers[REG_STATUS - start]
+    if "uptime" in due_keys:
+        values["uptime"] = decode_uint32(registers[REG_UPTIME - start:REG_UPTIME - start + 2])
+    return values
+
+
+def _combine_words_u32(high, low):
+    """Combine arrays of high/low register words into uint32 values"""
+    return (high.astype(np.uint32) << np.uint32(16)) | low.astype(np.uint32)
+
+
+if np is not None and njit is not None:
+    # LLVM-compiled combine loop; worthwhile once the device count grows
+    _combine_words_u32 = njit(cache=True)(_combine_words_u32)
+
+
+def decode_span_batch(register_rows, start, due_keys):
+    """Decode identical register spans from several devices in one pass
+
+    Stacks the rows into one (N, span) array and decodes each field for
+    all devices with a single vectorized combine, so per-device decode
+    overhead stays flat as the device count grows. Scattering back into
+    per-device dicts happens here in plain Python, outside any compiled
+    kernel. Falls back to per-row decode_span without numpy or for a
+    single row.
+    """
+    if np is None or len(register_rows) == 1:
+        return [decode_span(rows, start, due_keys) for rows in register_rows]
+
+    arr = np.asarray(register_rows, dtype=np.uint16)
+    values = [{} for _ in register_rows]
+
+    if "environment" in due_keys:
+        offset = REG_TEMPERATURE - start
+        temps = _combine_words_u32(arr[:, offset], arr[:, offset + 1]).view(np.float32)
+        hums = _combine_words_u32(arr[:, offset + 2], arr[:, offset + 3]).view(np.float32)
+        for fields, temperature, humidity in zip(values, temps.tolist(), hums.tolist()):
+            fields["temperature"] = temperature
+            fields["humidity"] = humidity
+
+    if "status" in due_keys:
+        for fields, status in zip(values, arr[:, REG_STATUS - start].tolist()):
+            fields["status"] = status
+
+    if "uptime" in due_keys:
+        offset = REG_UPTIME - start
+        uptimes = _combine_words_u32(arr[:, offset], arr[:, offset + 1])
+        for fields, uptime in zip(values, uptimes.tolist()):
+            fields["uptime"] = uptime
+
+    return values
+
+
+def group_devices_by_endpoint(devices):
+    """Group device configs by (ip, port) so endpoints are shared"""
+    groups = {}
+    for device in devices:
+        groups.setdefault((device["ip"], device["port"]), []).append(device)
+    return groups
+
+
+class DevicePlan:
+    """Pre-computed polling plan for one Modbus device
+
+    The device config and register map are static, so everything the hot
+    loop needs is specialized here once at startup: unit ID and node
+    entries become plain attributes, and the FC03 span is pre-computed
+    for every combination of due register groups. The polling loop then
+    never repeats config-dict lookups or span min/max math.
+    """
+
+    __slots__ = ("name", "unit_id", "nodes", "deadlines", "backoff", "next_poll", "spans")
+
+    def __init__(self, device, nodes):
+        self.name = device["name"]
+        self.unit_id = device["unit_id"]
+        self.nodes = nodes
+        self.deadlines = {group["key"]: 0.0 for group in REGISTER_GROUPS}
+        self.backoff = BACKOFF_INITIAL
+        self.next_poll = 0.0
+
+        # (start, count) for every non-empty combination of due groups
+        self.spans = {}
+        for n in range(1, len(REGISTER_GROUPS) + 1):
+            for combo in itertools.combinations(REGISTER_GROUPS, n):
+                start = min(group["address"] for group in combo)
+                end = max(group["address"] + group["count"] for group in combo)
+                self.spans[frozenset(group["key"] for group in combo)] = (start, end - start)
+
+
+async def poll_endpoint(server, endpoint, client, due_plans):
+    """Poll the due devices behind one Modbus TCP endpoint over a shared client
+
+    due_plans is a list of (DevicePlan, frozenset of due group keys).
+
+    The FC03 requests are fired concurrently on the one socket; pymodbus
+    matches responses by transaction ID, so requests are pipelined
+    instead of paying one round-trip per unit ID. Responses covering the
+    same span (the common case, since devices share the schedule) are
+    then decoded together in one vectorized batch.
+
+    Returns a per-device success map so the caller can back off devices
+    that keep failing.
+    """
+    ip, port = endpoint
+
+    # Reuse the long-lived connection; only reconnect after a failure
+    # so the happy path pays no TCP handshake per poll
+    if not client.connected:
+        await client.connect()
+        if not client.connected:
+            logger.error("Failed to connect to %s:%s", ip, port)
+            for plan, _ in due_plans:
+                await write_connection_status(plan.nodes, "DISCONNECTED")
+            return {plan.name: False for plan, _ in due_plans}
+
+    # Pre-computed span covering each device's due groups
+    spans = [(plan, *plan.spans[due_keys], due_keys) for plan, due_keys in due_plans]
+
+    # Phase 1: pipelined FC03 reads
+    reads = await asyncio.gather(
+        *(
+            read_device_span(plan, client, start, count)
+            for plan, start, count, _ in spans
+        )
+    )
+
+    outcomes = {
+        plan.name: registers is not None
+        for (plan, _, _, _), registers in zip(spans, reads)
+    }
+
+    # Phase 2: batch-decode devices whose responses share a span shape
+    batches = {}
+    for (plan, start, _, due_keys), registers in zip(spans, reads):
+        if registers is not None:
+            batches.setdefault((start, due_keys), []).append((plan, registers))
+
+    loop = asyncio.get_running_loop()
+    for (start, due_keys), members in batches.items():
+        decoded = await loop.run_in_executor(
+            _DECODE_POOL,
+            decode_span_batch,
+            [registers for _, registers in members],
+            start,
+            due_keys,
+        )
+        await asyncio.gather(
+            *(
+                publish_device_values(server, plan.name, plan.nodes, values)
+                for (plan, _), values in zip(members, decoded)
+            )
+        )
+
+    return outcomes
+
+
+async def read_device_span(plan, client, start, count):
+    """Read one FC03 span from a Modbus device; returns the registers or None
+
+    Modbus protocol uses 0-based addressing here.
+    """
     try:
-        if not client.connect():
-            logger.error(f"[{name}] Failed to connect to {ip}:{port}")
-            await nodes["status"].write_value("DISCONNECTED")
-            return False
-
-        # Read all registers (0-6) using FC03 (Read Holding Registers)
-        # Modbus protocol uses 0-based addressing here
-        result = client.read_holding_registers(address=0, count=7, device_id=unit_id)
+        result = await client.read_holding_registers(address=start, count=count, device_id=plan.unit_id)
 
         if result.isError():
-            logger.error(f"[{name}] Modbus read error: {result}")
-            await nodes["status"].write_value("ERROR")
+            logger.error("[%s] Modbus read error: %s", plan.name, result)
+            await write_connection_status(plan.nodes, "ERROR")
             client.close()
-            return False
-
-        # Decode data
-        registers = result.registers
-        temperature = decode_float32(registers[0:2])
-        humidity = decode_float32(registers[2:4])
-        status_value = registers[4]
-        uptime = decode_uint32(registers[5:7])
+            return None
 
-        # Update OPC-UA nodes
-        if temperature is not None:
-            await nodes["temperature"].write_value(temperature)
-        if humidity is not None:
-            await nodes["humidity"].write_value(humidity)
-
-        await nodes["device_status"].write_value(status_value)
-        if uptime is not None:
-            await nodes["uptime"].write_value(uptime)
-        await nodes["status"].write_value("CONNECTED")
-
-        logger.info(f"[{name}] T={temperature:.1f}°C, H={humidity:.1f}%, Status={status_value}, Uptime={uptime}s")
+        return result.registers
 
+    except Exception as e:
+        logger.error("[%s] Exception: %s", plan.name, e)
+        await write_connection_status(plan.nodes, "ERROR")
         client.close()
-        return True
+        return None
 
-    except Exception as e:
-        logger.error(f"[{name}] Exception: {e}")
-        await nodes["status"].write_value("ERROR")
-        try:
-            client.close()
-        except:
-            pass
-        return False
+
+async def write_node_values(server, writes):
+    """Write (node entry, value) pairs in a single OPC-UA Write service call
+
+    Batches all DataValues into one request on the internal session, so
+    dispatch and subscription bookkeeping are paid once per poll instead
+    of once per variable.
+    """
+    params = ua.WriteParameters(
+        NodesToWrite=[
+            ua.WriteValue(
+                NodeId=entry["node"].nodeid,
+                AttributeId=ua.AttributeIds.Value,
+                Value=ua.DataValue(ua.Variant(value, entry["vtype"])),
+            )
+            for entry, value in writes
+        ]
+    )
+    await server.iserver.isession.write(params)
+
+
+def _stage_write(writes, entry, value, deadband=None):
+    """Queue a write only when the value differs from the last one written
+
+    Unchanged values would still fan out subscription notifications to
+    every connected client, so they are dropped here. For analog values
+    a deadband suppresses changes smaller than the sensor resolution.
+    """
+    last = entry["last"]
+    if deadband is not None and last is not None:
+        if abs(value - last) < deadband:
+            return
+    elif value == last:
+        return
+    writes.append((entry, value))
+    entry["last"] = value
+
+
+async def write_connection_status(nodes, value):
+    """Write ConnectionStatus immediately, skipping unchanged values"""
+    entry = nodes["status"]
+    if value != entry["last"]:
+        await entry["node"].write_value(value)
+        entry["last"] = value
+
+
+async def publish_device_values(server, name, nodes, values):
+    """Publish decoded field values to the device's OPC-UA nodes"""
+    writes = []
+    log_parts = []
+
+    temperature = values.get("temperature")
+    if temperature is not None:
+        # Round to sensor resolution so jitter below 0.1 doesn't publish
+        temperature = round(temperature, 1)
+        _stage_write(writes, nodes["temperature"], temperature, deadband=DEADBAND_ABSOLUTE)
+        log_parts.append(f"T={temperature:.1f}°C")
+
+    humidity = values.get("humidity")
+    if humidity is not None:
+        humidity = round(humidity, 1)
+        _stage_write(writes, nodes["humidity"], humidity, deadband=DEADBAND_ABSOLUTE)
+        log_parts.append(f"H={humidity:.1f}%")
+
+    status_value = values.get("status")
+    if status_value is not None:
+        _stage_write(writes, nodes["device_status"], status_value)
+        log_parts.append(f"Status={status_value}")
+
+    uptime = values.get("uptime")
+    if uptime is not None:
+        _stage_write(writes, nodes["uptime"], uptime)
+        log_parts.append(f"Uptime={uptime}s")
+
+    _stage_write(writes, nodes["status"], "CONNECTED")
+    if writes:
+        await write_node_values(server, writes)
+
+    logger.info("[%s] %s", name, ", ".join(log_parts))
+
+
+def build_variable_item(parent_nodeid, idx, device_name, browse_name, vtype, datatype_id, initial, description=None):
+    """Build an AddNodesItem for one writable device variable
+
+    Writability goes in the AccessLevel/UserAccessLevel attribute bits,
+    so no set_writable follow-up call is needed after creation.
+    """
+    attrs = ua.VariableAttributes()
+    attrs.SpecifiedAttributes = (
+        ua.NodeAttributesMask.DisplayName
+        | ua.NodeAttributesMask.Description
+        | ua.NodeAttributesMask.Value
+        | ua.NodeAttributesMask.DataType
+        | ua.NodeAttributesMask.ValueRank
+        | ua.NodeAttributesMask.AccessLevel
+        | ua.NodeAttributesMask.UserAccessLevel
+        | ua.NodeAttributesMask.Historizing
+    )
+    attrs.DisplayName = ua.LocalizedText(browse_name)
+    attrs.Description = description if description is not None else ua.LocalizedText(browse_name)
+    attrs.Value = ua.Variant(initial, vtype)
+    attrs.DataType = ua.NodeId(datatype_id)
+    attrs.ValueRank = ua.ValueRank.Scalar
+    attrs.AccessLevel = ua.AccessLevel.CurrentRead.mask | ua.AccessLevel.CurrentWrite.mask
+    attrs.UserAccessLevel = attrs.AccessLevel
+    attrs.Historizing = False
+
+    item = ua.AddNodesItem()
+    item.ParentNodeId = parent_nodeid
+    item.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HasComponent)
+    item.RequestedNewNodeId = ua.NodeId(f"{device_name}.{browse_name}", idx)
+    item.BrowseName = ua.QualifiedName(browse_name, idx)
+    item.NodeClass = ua.NodeClass.Variable
+    item.TypeDefinition = ua.NodeId(ua.ObjectIds.BaseDataVariableType)
+    item.NodeAttributes = attrs
+    return item
 
 
 async def main():
@@ -121,51 +456,129 @@ async def main():
     objects = server.get_objects_node()
     root = await objects.add_object(idx, "ModbusDevices")
 
-    # Create OPC-UA nodes for each Modbus device
-    device_nodes = {}
-
+    # Create all device variables in one AddNodes batch: one address-space
+    # mutation call instead of ten service dispatches per device
+    items = []
     for device in MODBUS_DEVICES:
         name = device["name"]
-        logger.info(f"Creating OPC-UA namespace for {name}")
+        logger.info("Creating OPC-UA namespace for %s", name)
 
         # Create device folder
         device_folder = await root.add_object(idx, name)
 
-        # Create variables for sensor data
-        temp_node = await device_folder.add_variable(idx, "Temperature", 0.0)
-        hum_node = await device_folder.add_variable(idx, "Humidity", 0.0)
-        status_node = await device_folder.add_variable(idx, "DeviceStatus", 0)
-        uptime_node = await device_folder.add_variable(idx, "Uptime", 0)
-        connection_node = await device_folder.add_variable(idx, "ConnectionStatus", "DISCONNECTED")
-
-        # Make variables writable by clients (optional)
-        await temp_node.set_writable()
-        await hum_node.set_writable()
-        await status_node.set_writable()
-        await uptime_node.set_writable()
-        await connection_node.set_writable()
-
-        device_nodes[name] = {
-            "temperature": temp_node,
-            "humidity": hum_node,
-            "device_status": status_node,
-            "uptime": uptime_node,
-            "status": connection_node,
-        }
+        for key, browse_name, vtype, datatype_id, initial in VARIABLE_SPECS:
+            # Advertise the deadband on the analog variables so
+            # subscribers can request a matching ua.DataChangeFilter
+            # (asyncua applies filters per monitored item, so clients
+            # opt in at subscription time)
+            description = None
+            if vtype is ua.VariantType.Float:
+                description = ua.LocalizedText(
+                    f"Absolute deadband {DEADBAND_ABSOLUTE}; subscribe with a matching DataChangeFilter"
+                )
+            items.append(
+                build_variable_item(device_folder.nodeid, idx, name, browse_name, vtype, datatype_id, initial, description)
+            )
+
+    results = await server.iserver.isession.add_nodes(items)
+
+    # Wrap the created nodes, caching each node's VariantType so polls
+    # skip type inference and its last written value so unchanged
+    # readings skip the write
+    device_nodes = {}
+    added = iter(results)
+    for device in MODBUS_DEVICES:
+        entries = {}
+        for key, _, vtype, _, _ in VARIABLE_SPECS:
+            result = next(added)
+            result.StatusCode.check()
+            entries[key] = {"node": server.get_node(result.AddedNodeId), "vtype": vtype, "last": None}
+        device_nodes[device["name"]] = entries
+
+    # One persistent Modbus client per endpoint, connected once at startup
+    # and reused across polls; devices sharing a gateway share the socket
+    endpoint_devices = group_devices_by_endpoint(MODBUS_DEVICES)
+    endpoint_clients = {}
+    for (ip, port) in endpoint_devices:
+        client = AsyncModbusTcpClient(ip, port=port)
+        await client.connect()
+        endpoint_clients[(ip, port)] = client
 
     logger.info("OPC-UA server starting on opc.tcp://0.0.0.0:4840/freeopcua/server/")
 
+    # Specialize each device's polling plan once; deadlines start at 0 so
+    # the first tick reads the full register map, and backoff state lives
+    # on the plan so a dead device is not hammered at full poll rate
+    endpoint_plans = {
+        endpoint: [DevicePlan(device, device_nodes[device["name"]]) for device in devices]
+        for endpoint, devices in endpoint_devices.items()
+    }
+
     async with server:
         logger.info("OPC-UA server is running")
 
-        # Polling loop
+        # Polling loop - each tick polls only the register groups that are
+        # due, and due endpoints are polled concurrently so cycle time is
+        # bounded by the slowest endpoint, not the sum of all round-trips
+        next_tick = time.monotonic()
         while True:
-            for device in MODBUS_DEVICES:
-                name = device["name"]
-                await poll_modbus_device(device, device_nodes[name])
-
-            # Wait before next poll
-            await asyncio.sleep(POLL_INTERVAL)
+            now = time.monotonic()
+            tasks = []
+            polled = []
+
+            for endpoint, plans in endpoint_plans.items():
+                due_plans = []
+                for plan in plans:
+                    if plan.next_poll > now:
+                        continue  # still backing off after failures
+                    deadlines = plan.deadlines
+                    due_keys = frozenset(
+                        group["key"] for group in REGISTER_GROUPS
+                        if deadlines[group["key"]] <= now
+                    )
+                    if due_keys:
+                        due_plans.append((plan, due_keys))
+                        for group in REGISTER_GROUPS:
+                            if group["key"] in due_keys:
+                                deadlines[group["key"]] = now + group["period"]
+
+                if due_plans:
+                    polled.append((endpoint, due_plans))
+                    tasks.append(
+                        asyncio.wait_for(
+                            poll_endpoint(server, endpoint, endpoint_clients[endpoint], due_plans),
+                            timeout=POLL_INTERVAL * 0.9,
+                        )
+                    )
+
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            for (endpoint, due_plans), result in zip(polled, results):
+                if isinstance(result, Exception):
+                    logger.error("[%s:%s] Poll failed: %s", endpoint[0], endpoint[1], result)
+                    outcomes = {}
+                else:
+                    outcomes = result
+
+                for plan, _ in due_plans:
+                    if outcomes.get(plan.name, False):
+                        plan.backoff = BACKOFF_INITIAL
+                        plan.next_poll = 0.0
+                    else:
+                        plan.next_poll = now + plan.backoff
+                        logger.warning("[%s] Backing off for %.0fs", plan.name, plan.backoff)
+                        plan.backoff = min(plan.backoff * 2, BACKOFF_MAX)
+
+            # Wait until the next scheduler deadline rather than sleeping
+            # a fixed interval on top of the poll time, so network jitter
+            # doesn't drift the sample cadence
+            next_tick += BASE_TICK
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                logger.warning("Poll budget exceeded by %.3fs; skipping sleep", -delay)
+                next_tick = time.monotonic()
+            else:
+                await asyncio.sleep(delay)
 
 
 if __name__ == "__main__":
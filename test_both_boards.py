@@ -1,71 +1,119 @@
 #!/usr/bin/env python3
 """
-Test OPC-UA client to show data from both boards
+Test OPC-UA client to monitor both boards via a server subscription
 """
 import asyncio
-from asyncua import Client
+from asyncua import Client, ua
 
-async def read_board_data(client, board_name):
-    """Read all data from a specific board"""
-    try:
-        objects = client.get_objects_node()
-        modbus_devices = await objects.get_child(["2:ModbusDevices"])
-        board = await modbus_devices.get_child([f"2:{board_name}"])
-
-        temp = await board.get_child(["2:Temperature"])
-        hum = await board.get_child(["2:Humidity"])
-        status = await board.get_child(["2:DeviceStatus"])
-        uptime = await board.get_child(["2:Uptime"])
-        conn = await board.get_child(["2:ConnectionStatus"])
-
-        temp_val = await temp.read_value()
-        hum_val = await hum.read_value()
-        status_val = await status.read_value()
-        uptime_val = await uptime.read_value()
-        conn_val = await conn.read_value()
-
-        return {
-            "temperature": temp_val,
-            "humidity": hum_val,
-            "status": status_val,
-            "uptime": uptime_val,
-            "connection": conn_val
-        }
-    except Exception as e:
-        return None
+# Variable browse names under each board folder
+BOARD_VARIABLES = ["Temperature", "Humidity", "DeviceStatus", "Uptime", "ConnectionStatus"]
+
+BOARDS = {
+    "MODBUS_1": "10.10.10.100:502",
+    "MODBUS_2": "10.10.10.200:502",
+}
+
+# How often to print the current snapshot (seconds)
+PRINT_INTERVAL = 2.0
+
+def make_browse_path(board_name, variable):
+    """Build a BrowsePath from the Objects folder down to one variable"""
+    path = ua.BrowsePath()
+    path.StartingNode = ua.NodeId(ua.ObjectIds.ObjectsFolder)
+    for browse_name in ("ModbusDevices", board_name, variable):
+        element = ua.RelativePathElement()
+        element.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HierarchicalReferences)
+        element.IsInverse = False
+        element.IncludeSubtypes = True
+        element.TargetName = ua.QualifiedName(browse_name, 2)
+        path.RelativePath.Elements.append(element)
+    return path
+
+async def resolve_all_nodes(client):
+    """Resolve every board variable in one TranslateBrowsePaths call
+
+    get_child costs one TranslateBrowsePaths round-trip per variable;
+    sending all the browse paths in a single request resolves the whole
+    address space of interest in one round-trip, and the returned Node
+    objects are cached for the rest of the session.
+    """
+    paths = []
+    keys = []
+    for board_name in BOARDS:
+        for variable in BOARD_VARIABLES:
+            paths.append(make_browse_path(board_name, variable))
+            keys.append((board_name, variable))
+
+    results = await client.uaclient.translate_browsepaths_to_nodeids(paths)
+
+    nodes = {board_name: {} for board_name in BOARDS}
+    for (board_name, variable), result in zip(keys, results):
+        result.StatusCode.check()
+        nodes[board_name][variable] = client.get_node(result.Targets[0].TargetId)
+    return nodes
+
+class BoardDataHandler:
+    """Collects data change notifications into per-board snapshots
+
+    The server pushes only changed values over the existing session, so
+    no client-initiated Reads are needed once the subscription is up.
+    """
+
+    def __init__(self):
+        self.latest = {board: {} for board in BOARDS}
+        self._node_map = {}
+
+    def map_node(self, node, board_name, variable):
+        self._node_map[node.nodeid] = (board_name, variable)
+
+    def datachange_notification(self, node, val, data):
+        board_name, variable = self._node_map[node.nodeid]
+        self.latest[board_name][variable] = val
+
+def print_snapshot(latest):
+    print("=" * 60)
+    for board_name, address in BOARDS.items():
+        data = latest[board_name]
+        if data.get("ConnectionStatus") == "CONNECTED":
+            uptime = data.get("Uptime", 0)
+            print(f"{board_name} ({address}) - CONNECTED")
+            print(f"  Temperature: {data.get('Temperature', 0.0):.1f}°C")
+            print(f"  Humidity: {data.get('Humidity', 0.0):.1f}%")
+            print(f"  Device Status: {data.get('DeviceStatus')}")
+            print(f"  Uptime: {uptime}s ({uptime//60}min {uptime%60}s)")
+        else:
+            print(f"{board_name} ({address}) - DISCONNECTED")
+    print("=" * 60)
 
 async def main():
     url = "opc.tcp://localhost:4840/freeopcua/server/"
     print(f"Connecting to OPC-UA server at {url}\n")
 
     async with Client(url=url) as client:
-        print("=" * 60)
-
-        # Read MODBUS_1
-        data1 = await read_board_data(client, "MODBUS_1")
-        if data1 and data1["connection"] == "CONNECTED":
-            print("MODBUS_1 (10.10.10.100:502) - CONNECTED")
-            print(f"  Temperature: {data1['temperature']:.1f}°C")
-            print(f"  Humidity: {data1['humidity']:.1f}%")
-            print(f"  Device Status: {data1['status']}")
-            print(f"  Uptime: {data1['uptime']}s ({data1['uptime']//60}min {data1['uptime']%60}s)")
-        else:
-            print("MODBUS_1 (10.10.10.100:502) - DISCONNECTED")
-
-        print()
-
-        # Read MODBUS_2
-        data2 = await read_board_data(client, "MODBUS_2")
-        if data2 and data2["connection"] == "CONNECTED":
-            print("MODBUS_2 (10.10.10.200:502) - CONNECTED")
-            print(f"  Temperature: {data2['temperature']:.1f}°C")
-            print(f"  Humidity: {data2['humidity']:.1f}%")
-            print(f"  Device Status: {data2['status']}")
-            print(f"  Uptime: {data2['uptime']}s ({data2['uptime']//60}min {data2['uptime']%60}s)")
-        else:
-            print("MODBUS_2 (10.10.10.200:502) - DISCONNECTED")
+        handler = BoardDataHandler()
+        all_nodes = []
+
+        # Resolve all nodes in one request and map them for the handler
+        board_nodes = await resolve_all_nodes(client)
+        for board_name, nodes in board_nodes.items():
+            for variable, node in nodes.items():
+                handler.map_node(node, board_name, variable)
+                all_nodes.append(node)
+
+            # Prime the snapshot with one batched read; afterwards the
+            # subscription keeps it current
+            values = await client.read_values([nodes[v] for v in BOARD_VARIABLES])
+            handler.latest[board_name] = dict(zip(BOARD_VARIABLES, values))
 
-        print("=" * 60)
+        subscription = await client.create_subscription(500, handler)
+        await subscription.subscribe_data_change(all_nodes)
+
+        while True:
+            print_snapshot(handler.latest)
+            await asyncio.sleep(PRINT_INTERVAL)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nStopped")
@@ -35,12 +35,17 @@ async def main():
         uptime = await modbus_1.get_child(["2:Uptime"])
         conn = await modbus_1.get_child(["2:ConnectionStatus"])
 
+        # One Read service call covering all five variables
+        temp_val, hum_val, status_val, uptime_val, conn_val = await client.read_values(
+            [temp, hum, status, uptime, conn]
+        )
+
         print("\n=== MODBUS_1 Current Values ===")
-        print(f"Temperature: {await temp.read_value()}°C")
-        print(f"Humidity: {await hum.read_value()}%")
-        print(f"Device Status: {await status.read_value()}")
-        print(f"Uptime: {await uptime.read_value()}s")
-        print(f"Connection Status: {await conn.read_value()}")
+        print(f"Temperature: {temp_val}°C")
+        print(f"Humidity: {hum_val}%")
+        print(f"Device Status: {status_val}")
+        print(f"Uptime: {uptime_val}s")
+        print(f"Connection Status: {conn_val}")
 
         # Try MODBUS_2 (will show DISCONNECTED)
         try: